@@ -1,5 +1,10 @@
+import re
+import sys
+from bisect import insort
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import Callable, Deque, List, Dict, Optional, Any, Tuple
 
 # ================================================
 # Constantes
@@ -7,21 +12,30 @@ from typing import List, Dict, Optional, Any
 AGENCIA_PADRAO = "1503"
 LIMITE_SAQUES_DIARIOS_PADRAO = 3
 LIMITE_VALOR_SAQUE_PADRAO = 500.0
+LIMITE_EXTRATO_PADRAO = 1000
+_UM_DIA = timedelta(days=1)
+_BANNER_PRINCIPAL = f"\n═{' SISTEMA BANCÁRIO PYTHON ':=^48}"
+_BANNER_OPERACOES = f"\n═{' OPERAÇÕES ':=^48}"
+_BANNER_EXTRATO = f"\n═{' EXTRATO ':=^48}"
+_BANNER_CONTAS = f"\n═{' CONTAS CADASTRADAS ':=^48}"
+_BANNER_USUARIOS = f"\n═{' USUÁRIOS CADASTRADOS ':=^48}"
+_MOEDA_TRANS = str.maketrans({",": ".", ".": ","})
+_DECIMAL_TRANS = str.maketrans({",": "."})
+_NAO_DIGITO_RE = re.compile(r"\D")
+_CPF_RE = re.compile(r"\d{11}")
 
 # ================================================
 # Funções Auxiliares
 # ================================================
 def limpar_cpf(cpf: str) -> str:
     """Remove caracteres não numéricos de uma string de CPF."""
-    return ''.join(filter(str.isdigit, cpf))
+    if _CPF_RE.fullmatch(cpf):
+        return cpf
+    return _NAO_DIGITO_RE.sub("", cpf)
 
 def formatar_moeda(valor: float) -> str:
     """Formata um valor float para o formato de moeda R$ XX,XX."""
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-def obter_data_hora_atual_str() -> str:
-    """Retorna a data e hora atuais formatadas."""
-    return datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    return "R$ " + f"{valor:,.2f}".translate(_MOEDA_TRANS)
 
 def validar_data(data_str: str) -> Optional[datetime]:
     """Valida e converte uma string de data (dd/mm/aaaa) para datetime."""
@@ -33,36 +47,46 @@ def validar_data(data_str: str) -> Optional[datetime]:
 # ================================================
 # Classes de Domínio
 # ================================================
+@dataclass(frozen=True, slots=True)
 class Usuario:
-    def __init__(self, cpf: str, nome: str, data_nascimento: datetime, endereco: str):
-        self.cpf = cpf
-        self.nome = nome
-        self.data_nascimento = data_nascimento
-        self.endereco = endereco
+    cpf: str
+    nome: str
+    data_nascimento: datetime
+    endereco: str
 
     def __str__(self) -> str:
-        return f"Nome: {self.nome}, CPF: {self.cpf}, Nascimento: {self.data_nascimento.strftime('%d/%m/%Y')}"
+        return f"Nome: {self.nome}, CPF: {self.cpf}, Nascimento: {self.data_nascimento:%d/%m/%Y}"
 
 class ContaBancaria:
+    __slots__ = (
+        "agencia", "numero_conta", "titular", "saldo", "extrato",
+        "saques_realizados", "limite_saques_diarios", "limite_valor_saque",
+        "numero_fmt",
+    )
+
     def __init__(self, numero_conta: int, titular: Usuario, agencia: str = AGENCIA_PADRAO):
         self.agencia = agencia
         self.numero_conta = numero_conta
+        self.numero_fmt = f"{numero_conta:04d}"
         self.titular = titular
         self.saldo: float = 0.0
-        self.extrato: List[str] = []
-        self.saques_realizados: List[datetime] = [] 
+        self.extrato: Deque[Tuple[datetime, str, float]] = deque(maxlen=LIMITE_EXTRATO_PADRAO)
+        self.saques_realizados: Deque[datetime] = deque()
         self.limite_saques_diarios = LIMITE_SAQUES_DIARIOS_PADRAO
         self.limite_valor_saque = LIMITE_VALOR_SAQUE_PADRAO
 
-    def _registrar_transacao(self, tipo: str, valor: float):
-        self.extrato.append(f"{obter_data_hora_atual_str()} - {tipo}: {formatar_moeda(valor)}")
+    def _registrar_transacao(self, tipo: str, valor: float, agora: Optional[datetime] = None):
+        if agora is None:
+            agora = datetime.now()
+        self.extrato.append((agora, tipo, valor))
 
     def depositar(self, valor: float) -> bool:
         if valor <= 0:
             print("Erro: Valor do depósito deve ser positivo.")
             return False
+        agora = datetime.now()
         self.saldo += valor
-        self._registrar_transacao("Depósito", valor)
+        self._registrar_transacao("Depósito", valor, agora)
         print("✅ Depósito realizado com sucesso!")
         return True
 
@@ -72,9 +96,9 @@ class ContaBancaria:
             return False
 
         agora = datetime.now()
-        saques_ultimas_24h = [
-            s for s in self.saques_realizados if agora - s < timedelta(days=1)
-        ]
+        limite_janela = agora - _UM_DIA
+        while self.saques_realizados and self.saques_realizados[0] <= limite_janela:
+            self.saques_realizados.popleft()
 
         if self.saldo < valor:
             print("Erro: Saldo insuficiente.")
@@ -82,44 +106,56 @@ class ContaBancaria:
         if valor > self.limite_valor_saque:
             print(f"Erro: Limite por saque é de {formatar_moeda(self.limite_valor_saque)}.")
             return False
-        if len(saques_ultimas_24h) >= self.limite_saques_diarios:
+        if len(self.saques_realizados) >= self.limite_saques_diarios:
             print("Erro: Limite de saques diários atingido.")
             return False
 
         self.saldo -= valor
-        self.saques_realizados.append(datetime.now())
-        self._registrar_transacao("Saque", valor)
+        # Invariante: saques_realizados fica em ordem crescente (o mais antigo à
+        # esquerda), mesmo se o relógio voltar (horário de verão, ajuste de NTP).
+        if self.saques_realizados and agora < self.saques_realizados[-1]:
+            insort(self.saques_realizados, agora)
+        else:
+            self.saques_realizados.append(agora)
+        self._registrar_transacao("Saque", valor, agora)
         print("✅ Saque realizado com sucesso!")
         return True
 
     def exibir_extrato(self):
-        print(f"\n═{' EXTRATO ':=^48}")
-        print(f"Agência: {self.agencia} | Conta: {self.numero_conta:04d}") 
-        print(f"Titular: {self.titular.nome}")
-        print("\nMovimentações:")
+        linhas = [
+            _BANNER_EXTRATO,
+            f"Agência: {self.agencia} | Conta: {self.numero_fmt}",
+            f"Titular: {self.titular.nome}",
+            "\nMovimentações:",
+        ]
+        if len(self.extrato) == self.extrato.maxlen:
+            linhas.append(f"Exibindo as últimas {self.extrato.maxlen} movimentações.")
         if not self.extrato:
-            print("Nenhuma movimentação registrada.")
+            linhas.append("Nenhuma movimentação registrada.")
         else:
-            for movimento in self.extrato:
-                print(movimento)
-        print(f"\nSaldo atual: {formatar_moeda(self.saldo)}")
-        print("=" * 50)
+            linhas.extend(
+                f"{data_hora:%d/%m/%Y %H:%M:%S} - {tipo}: {formatar_moeda(valor)}"
+                for data_hora, tipo, valor in self.extrato
+            )
+        linhas.append(f"\nSaldo atual: {formatar_moeda(self.saldo)}")
+        linhas.append("=" * 50)
+        sys.stdout.write("\n".join(linhas) + "\n")
 
     def __str__(self) -> str:
-        return f"Conta {self.numero_conta:04d} (Ag. {self.agencia}) - Titular: {self.titular.nome} - Saldo: {formatar_moeda(self.saldo)}"
+        return f"Conta {self.numero_fmt} (Ag. {self.agencia}) - Titular: {self.titular.nome} - Saldo: {formatar_moeda(self.saldo)}"
 
 # ================================================
 # Gestão do Banco (Centraliza usuários e contas)
 # ================================================
 class Banco:
     def __init__(self):
-        self.usuarios: List[Usuario] = []
-        self.contas: List[ContaBancaria] = []
+        self._usuarios_por_cpf: Dict[str, Usuario] = {}
+        self._contas_por_cpf: Dict[str, List[ContaBancaria]] = {}
+        self._contas_por_numero: Dict[int, ContaBancaria] = {}
         self._proximo_numero_conta = 1
 
     def buscar_usuario_por_cpf(self, cpf: str) -> Optional[Usuario]:
-        cpf_limpo = limpar_cpf(cpf)
-        return next((u for u in self.usuarios if u.cpf == cpf_limpo), None)
+        return self._usuarios_por_cpf.get(limpar_cpf(cpf))
 
     def cadastrar_usuario(self) -> Optional[Usuario]:
         print("\n--- Cadastro de Novo Usuário ---")
@@ -128,7 +164,7 @@ class Banco:
         if len(cpf) != 11:
             print("Erro: CPF deve conter 11 dígitos.")
             return None
-        if self.buscar_usuario_por_cpf(cpf):
+        if cpf in self._usuarios_por_cpf:
             print("Erro: CPF já cadastrado.")
             return None
 
@@ -149,7 +185,7 @@ class Banco:
         cidade = input("Cidade: ").strip()
         uf = input("UF (sigla): ").strip().upper()
         
-        if not all([logradouro, nro, bairro, cidade, uf]):
+        if not (logradouro and nro and bairro and cidade and uf):
             print("Erro: Todos os campos do endereço são obrigatórios.")
             return None
         if len(uf) != 2:
@@ -158,45 +194,47 @@ class Banco:
 
         endereco = f"{logradouro}, {nro} - {bairro} - {cidade}/{uf}"
         novo_usuario = Usuario(cpf, nome, data_nasc, endereco)
-        self.usuarios.append(novo_usuario)
+        self._usuarios_por_cpf[cpf] = novo_usuario
         print("✅ Usuário cadastrado com sucesso!")
         return novo_usuario
 
     def criar_conta_bancaria(self) -> Optional[ContaBancaria]:
         print("\n--- Criação de Nova Conta ---")
-        cpf_titular = limpar_cpf(input("CPF do titular: ").strip())
-        usuario_titular = self.buscar_usuario_por_cpf(cpf_titular)
+        usuario_titular = self.buscar_usuario_por_cpf(input("CPF do titular: ").strip())
 
         if not usuario_titular:
             print("Erro: Usuário não encontrado. Cadastre o usuário primeiro.")
             return None
 
         nova_conta = ContaBancaria(numero_conta=self._proximo_numero_conta, titular=usuario_titular)
-        self.contas.append(nova_conta)
+        self._contas_por_numero[nova_conta.numero_conta] = nova_conta
+        self._contas_por_cpf.setdefault(usuario_titular.cpf, []).append(nova_conta)
         self._proximo_numero_conta += 1
-        print(f"✅ Conta {nova_conta.numero_conta:04d} criada com sucesso para {usuario_titular.nome}!")
+        print(f"✅ Conta {nova_conta.numero_fmt} criada com sucesso para {usuario_titular.nome}!")
         return nova_conta
 
     def selecionar_conta(self, cpf_usuario: str) -> Optional[ContaBancaria]:
         cpf_limpo = limpar_cpf(cpf_usuario)
-        usuario = self.buscar_usuario_por_cpf(cpf_limpo)
-        if not usuario:
+        if cpf_limpo not in self._usuarios_por_cpf:
             print("Erro: Usuário não encontrado.")
             return None
 
-        contas_do_usuario = [c for c in self.contas if c.titular.cpf == cpf_limpo]
+        contas_do_usuario = self._contas_por_cpf.get(cpf_limpo, ())
 
         if not contas_do_usuario:
             print(f"Nenhuma conta encontrada para o CPF {cpf_limpo}.")
             return None
 
         if len(contas_do_usuario) == 1:
-            print(f"Conta {contas_do_usuario[0].numero_conta:04d} selecionada automaticamente.")
+            print(f"Conta {contas_do_usuario[0].numero_fmt} selecionada automaticamente.")
             return contas_do_usuario[0]
 
-        print("\nSuas contas:")
-        for i, conta in enumerate(contas_do_usuario):
-            print(f"{i + 1}. Conta {conta.numero_conta:04d} - Saldo: {formatar_moeda(conta.saldo)}")
+        linhas = ["\nSuas contas:"]
+        linhas.extend(
+            f"{i}. Conta {conta.numero_fmt} - Saldo: {formatar_moeda(conta.saldo)}"
+            for i, conta in enumerate(contas_do_usuario, 1)
+        )
+        sys.stdout.write("\n".join(linhas) + "\n")
 
         while True:
             try:
@@ -209,21 +247,49 @@ class Banco:
                 print("Entrada inválida. Digite um número.")
     
     def listar_contas_cadastradas(self):
-        print(f"\n═{' CONTAS CADASTRADAS ':=^48}")
-        if not self.contas:
-            print("Nenhuma conta cadastrada.")
-            return
-        for conta in self.contas:
-            print(conta) 
-        print("=" * 50)
+        linhas = [_BANNER_CONTAS]
+        if not self._contas_por_numero:
+            linhas.append("Nenhuma conta cadastrada.")
+        else:
+            linhas.extend(str(conta) for conta in self._contas_por_numero.values())
+            linhas.append("=" * 50)
+        sys.stdout.write("\n".join(linhas) + "\n")
+
+    def listar_usuarios_cadastrados(self):
+        linhas = [_BANNER_USUARIOS]
+        if not self._usuarios_por_cpf:
+            linhas.append("Nenhum usuário cadastrado.")
+        linhas.extend(str(usuario) for usuario in self._usuarios_por_cpf.values())
+        linhas.append("=" * 50)
+        sys.stdout.write("\n".join(linhas) + "\n")
 
 # ================================================
 # Interface com Usuário (Menus e Interação)
 # ================================================
+def _depositar(conta: ContaBancaria):
+    try:
+        valor = float(input("Valor do depósito: R$ ").translate(_DECIMAL_TRANS))
+        conta.depositar(valor)
+    except ValueError:
+        print("Erro: Valor inválido para depósito.")
+
+def _sacar(conta: ContaBancaria):
+    try:
+        valor = float(input("Valor do saque: R$ ").translate(_DECIMAL_TRANS))
+        conta.sacar(valor)
+    except ValueError:
+        print("Erro: Valor inválido para saque.")
+
+_OPERACOES_HANDLERS: Dict[str, Callable[[ContaBancaria], Any]] = {
+    "1": _depositar,
+    "2": _sacar,
+    "3": ContaBancaria.exibir_extrato,
+}
+
 def menu_operacoes_bancarias(conta_selecionada: ContaBancaria):
     while True:
-        print(f"\n═{' OPERAÇÕES ':=^48}")
-        print(f"Conta: {conta_selecionada.numero_conta:04d} | Titular: {conta_selecionada.titular.nome}")
+        print(_BANNER_OPERACOES)
+        print(f"Conta: {conta_selecionada.numero_fmt} | Titular: {conta_selecionada.titular.nome}")
         print("1 - Depositar")
         print("2 - Sacar")
         print("3 - Extrato")
@@ -231,28 +297,31 @@ def menu_operacoes_bancarias(conta_selecionada: ContaBancaria):
 
         sub_opcao = input("Opção: ").strip()
 
-        if sub_opcao == "1":
-            try:
-                valor = float(input("Valor do depósito: R$ ").strip().replace(",", "."))
-                conta_selecionada.depositar(valor)
-            except ValueError:
-                print("Erro: Valor inválido para depósito.")
-        elif sub_opcao == "2":
-            try:
-                valor = float(input("Valor do saque: R$ ").strip().replace(",", "."))
-                conta_selecionada.sacar(valor)
-            except ValueError:
-                print("Erro: Valor inválido para saque.")
-        elif sub_opcao == "3":
-            conta_selecionada.exibir_extrato()
-        elif sub_opcao == "4":
+        if sub_opcao == "4":
             break
+        handler = _OPERACOES_HANDLERS.get(sub_opcao)
+        if handler:
+            handler(conta_selecionada)
         else:
             print("Opção inválida. Tente novamente.")
 
+def _acessar_conta(banco: Banco):
+    cpf = input("Digite o CPF do titular da conta: ").strip()
+    conta_selecionada = banco.selecionar_conta(cpf)
+    if conta_selecionada:
+        menu_operacoes_bancarias(conta_selecionada)
+
+_MENU_HANDLERS: Dict[str, Callable[[Banco], Any]] = {
+    "1": Banco.cadastrar_usuario,
+    "2": Banco.criar_conta_bancaria,
+    "3": _acessar_conta,
+    "4": Banco.listar_contas_cadastradas,
+    "5": Banco.listar_usuarios_cadastrados,
+}
+
 def menu_principal(banco: Banco):
     while True:
-        print(f"\n═{' SISTEMA BANCÁRIO PYTHON ':=^48}")
+        print(_BANNER_PRINCIPAL)
         print("1 - Novo Usuário")
         print("2 - Nova Conta Bancária")
         print("3 - Acessar Conta (Operações)")
@@ -262,27 +331,12 @@ def menu_principal(banco: Banco):
 
         opcao = input("Opção: ").strip()
 
-        if opcao == "1":
-            banco.cadastrar_usuario()
-        elif opcao == "2":
-            banco.criar_conta_bancaria()
-        elif opcao == "3":
-            cpf = input("Digite o CPF do titular da conta: ").strip()
-            conta_selecionada = banco.selecionar_conta(cpf)
-            if conta_selecionada:
-                menu_operacoes_bancarias(conta_selecionada)
-        elif opcao == "4":
-            banco.listar_contas_cadastradas()
-        elif opcao == "5":
-            print(f"\n═{' USUÁRIOS CADASTRADOS ':=^48}")
-            if not banco.usuarios:
-                print("Nenhum usuário cadastrado.")
-            for usuario in banco.usuarios:
-                print(usuario) 
-            print("=" * 50)
-        elif opcao == "6":
+        if opcao == "6":
             print("\nObrigado por utilizar nossos serviços!")
             break
+        handler = _MENU_HANDLERS.get(opcao)
+        if handler:
+            handler(banco)
         else:
             print("Opção inválida. Tente novamente.")
 